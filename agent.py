@@ -8,54 +8,305 @@ multiple LLM models based on query complexity.
 Key Components:
     - Voice pipeline with VAD, STT, LLM, and TTS
     - LangGraph adapter for multi-model orchestration
-    - SimpleLLMStream for streaming responses
+    - SimpleLLMStream for streaming responses token-by-token
     - LiveKit server setup and room management
 
 Author: Assignment D9 - LiveKit Voice Agent
 """
 
+import asyncio
+import base64
+import functools
+import hashlib
+import hmac
+import importlib.util
+import json
+import logging
 import os
-from dotenv import load_dotenv
+import re
+import sys
+import time
+import types
+import uuid
+import weakref
+from contextlib import aclosing
+import env_boot
 from datetime import timedelta
 from livekit import api
+from livekit.api.access_token import Claims
 from livekit.agents import (
     AutoSubscribe,
     JobContext,
+    JobProcess,
     AgentServer,
     cli,
     llm,
 )
+from livekit.agents.tts import TTS
 from livekit.agents.voice import Agent, AgentSession
 from livekit.plugins import openai, silero
 
-# Import LangGraph agent from previous assignment (D8)
-from langgraph_agent import create_graph
+from response_cache import ExactResponseCache, create_semantic_cache
 
-# Load environment variables from .env file
-load_dotenv()
 
+def _lazy_import(name: str):
+    """Import a module whose code only runs on first attribute access.
 
+    Uses importlib's LazyLoader, so the returned module object can be bound
+    at import time like a normal import while the actual loading is deferred
+    until it is first used.
+
+    Args:
+        name: Absolute module name
+
+    Returns:
+        module: The (possibly not yet executed) module
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# Import LangGraph agent from previous assignment (D8). Loading it pulls in
+# LangChain and the Gemini client, which only the voice pipeline needs, so it
+# is deferred: importing agent for its token helpers (generate_token.py)
+# skips that cost entirely
+langgraph_agent = _lazy_import("langgraph_agent")
+
+# Module logger; LiveKit forwards job-process records to the main process
+# through its own log queue, so no handlers are attached here
+logger = logging.getLogger("agent")
+
+# Sentence boundary: terminal punctuation followed by whitespace, or a newline.
+# Deltas are buffered up to the last boundary so TTS receives whole sentences
+_SENTENCE_BOUNDARY_RE = re.compile(r"[.!?]\s+|\n+")
+
+
+# Bound the number of in-flight LangGraph calls. Every LiveKit job runs on its
+# own event loop (in its own process, or in its own thread with the THREAD
+# executor), and an asyncio.Semaphore only works on one loop, so there is one
+# limit per loop - that is, per room: it only queues overlapping generations
+# of one session (e.g. a preemptive generation still streaming when the next
+# turn starts). It does not coordinate rooms - Gemini's quota is shared
+# across jobs and enforced by the API itself (429s).
+# Calls are deliberately not batched behind a linger window: Gemini has no
+# multi-prompt endpoint (LangChain's batch() fans out one HTTP request per
+# prompt), and a batched call could not stream its first sentence to TTS.
+# Event loop -> its semaphore; entries go away with their loop
+_graph_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _graph_semaphore() -> asyncio.Semaphore:
+    """Return the LangGraph concurrency limit of the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _graph_semaphores.get(loop)
+    if semaphore is None:
+        env_boot.boot()
+        semaphore = _graph_semaphores[loop] = asyncio.Semaphore(
+            int(os.environ.get("LANGGRAPH_CONCURRENCY", "4"))
+        )
+    return semaphore
+
+
+def _extract_text(content) -> str:
+    """Extract the text of a chat message's content.
+
+    Args:
+        content: Message content as delivered by LiveKit (string, list of
+                 parts in multimodal format, or any other object)
+
+    Returns:
+        str: Text of the message ("" if the content has no text part)
+    """
+    # Handle different content formats from LiveKit
+    if isinstance(content, str):
+        # Simple string content
+        return content
+    if isinstance(content, list):
+        # Content as list of parts (multimodal format): collect the text
+        # parts in a single pass, skipping images/audio
+        parts = []
+        for part in content:
+            if isinstance(part, str):
+                # Direct string in list
+                text = part
+            elif isinstance(part, dict) and part.get("type") == "text":
+                # Extract text from dictionary format
+                text = part.get("text", "")
+            else:
+                continue
+            if text:
+                parts.append(text)
+        return parts[0] if len(parts) == 1 else " ".join(parts)
+    # Fallback: convert to string
+    return str(content)
+
+
+def _latest_user_message(items: list) -> str:
+    """Return the text of the most recent user message in a chat context.
+
+    LiveKit appends new messages at the tail, so the scan indexes backwards
+    from the end and stops at the first user message - normally the last
+    or second-to-last item.
+
+    Args:
+        items: Chat context items, oldest first
+
+    Returns:
+        str: Text of the latest user message ("" if there is none)
+    """
+    for i in range(len(items) - 1, -1, -1):
+        item = items[i]
+        if item.role == "user":
+            return _extract_text(item.content)
+    return ""
+
+
+# Canned answers for filler utterances that do not need an LLM round trip,
+# keyed on the normalized utterance (lowercase, no trailing punctuation)
+_CANNED_RESPONSES = {
+    "hello": "Hi! Where are you thinking of traveling?",
+    "hi": "Hi! Where are you thinking of traveling?",
+    "hey": "Hi! Where are you thinking of traveling?",
+    "hi there": "Hi! Where are you thinking of traveling?",
+    "hello there": "Hi! Where are you thinking of traveling?",
+    "good morning": "Good morning! Where are you thinking of traveling?",
+    "good afternoon": "Good afternoon! Where are you thinking of traveling?",
+    "good evening": "Good evening! Where are you thinking of traveling?",
+    "thanks": "You're welcome!",
+    "thank you": "You're welcome!",
+    "bye": "Goodbye, and safe travels!",
+    "goodbye": "Goodbye, and safe travels!",
+}
+
+# Short acknowledgements ("ok", "yeah sure", "got it") share one answer
+_ACKNOWLEDGEMENT_RE = re.compile(
+    r"(?:ok(?:ay)?|yes|yeah|yep|sure|got it|sounds good|cool|great)"
+    r"(?:[\s,]+(?:ok(?:ay)?|yes|yeah|yep|sure|thanks|thank you|great))*"
+)
+_ACKNOWLEDGEMENT_RESPONSE = "Great! What else can I help you plan?"
+
+
+def _canned_response(user_message: str) -> str | None:
+    """Return a canned answer for a trivial utterance, if there is one.
+
+    Args:
+        user_message: User message extracted from the chat context
+
+    Returns:
+        str or None: Canned response, or None if LangGraph should answer
+    """
+    normalized = user_message.strip().lower().rstrip(".!?,")
+    canned = _CANNED_RESPONSES.get(normalized)
+    if canned is None and _ACKNOWLEDGEMENT_RE.fullmatch(normalized):
+        canned = _ACKNOWLEDGEMENT_RESPONSE
+    return canned
+
+
+async def _replay(text: str):
+    """Yield an already-known response as a single delta."""
+    yield text
+
+
+@functools.lru_cache(maxsize=1)
 def get_livekit_url() -> str:
     """Retrieve LiveKit WebSocket URL from environment variables.
 
+    The URL is read once and cached for the life of the process; call
+    _reset_env_cache() after changing the environment.
+
     Returns:
         str: LiveKit server WebSocket URL (wss://...)
 
     Raises:
         ValueError: If LIVEKIT_URL environment variable is not set
     """
+    env_boot.boot()
     url = os.environ.get("LIVEKIT_URL")
     if not url:
         raise ValueError("LIVEKIT_URL environment variable is required")
     return url
 
 
+@functools.lru_cache(maxsize=1)
+def get_livekit_credentials() -> tuple[str | None, str | None]:
+    """Retrieve LiveKit API credentials from environment variables.
+
+    The credentials are read once and cached for the life of the process;
+    call _reset_env_cache() after changing the environment.
+
+    Returns:
+        tuple: (LIVEKIT_API_KEY, LIVEKIT_API_SECRET), either may be None
+    """
+    env_boot.boot()
+    return os.environ.get("LIVEKIT_API_KEY"), os.environ.get("LIVEKIT_API_SECRET")
+
+
+def _reset_env_cache() -> None:
+    """Forget cached environment values so they are re-read on next use.
+
+    Also drops minted tokens, which were signed with the old credentials,
+    and the Gemini clients, which were built with the old API key.
+    """
+    get_livekit_url.cache_clear()
+    get_livekit_credentials.cache_clear()
+    _token_cache.clear()
+    # Until langgraph_agent is first used it is an unexecuted lazy module
+    # with nothing cached; checking its type does not trigger the load
+    if type(langgraph_agent) is types.ModuleType:
+        langgraph_agent.get_google_api_key.cache_clear()
+        langgraph_agent._shared_models.cache_clear()
+
+
+# Tokens are valid for 1 hour; a minted token is reused for the same
+# (room, participant) until 5 minutes before it expires
+_TOKEN_TTL_SECONDS = int(timedelta(hours=1).total_seconds())
+_TOKEN_REUSE_SECONDS = _TOKEN_TTL_SECONDS - 300
+_TOKEN_CACHE_SIZE = 512
+_token_cache: dict[tuple[str, str], tuple[float, str]] = {}
+
+# JOSE header of every token, serialized and base64url-encoded once; matches
+# the header PyJWT (used by api.AccessToken) emits for HS256
+_JWT_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode bytes without padding, as JWTs require."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# Room access permissions shared by every token (only the room differs),
+# serialized once by the SDK so claim names match AccessToken.to_jwt()
+_VIDEO_GRANT_CLAIMS = Claims(
+    video=api.VideoGrants(
+        room_join=True,  # Allow joining the room
+        can_publish=True,  # Allow publishing audio/video
+        can_subscribe=True,  # Allow subscribing to other participants
+    )
+).asdict()["video"]
+
+
 def generate_token(room_name: str, participant_name: str) -> str:
     """Generate a JWT access token for LiveKit room authentication.
 
     Creates a signed JWT token with room access permissions including
-    audio/video publishing and subscribing capabilities. Token is valid
-    for 1 hour.
+    audio/video publishing and subscribing capabilities. Tokens are
+    minted valid for 1 hour; the returned token has at least 5 minutes of
+    validity left.
+
+    Tokens are cached per (room_name, participant_name) and reused until
+    5 minutes before they expire, so repeated calls skip the signing work.
+    On a miss the claims are assembled from the precomputed grants and
+    signed directly with hmac against a pre-encoded header, producing a
+    token with claims equivalent to api.AccessToken.to_jwt() (key order
+    may differ) without rebuilding the SDK's grant dataclasses or going
+    through PyJWT's generic encoder.
 
     Args:
         room_name: Name of the LiveKit room to grant access to
@@ -64,103 +315,183 @@ def generate_token(room_name: str, participant_name: str) -> str:
     Returns:
         str: JWT token string for room authentication
 
+    Raises:
+        ValueError: If LIVEKIT_API_KEY or LIVEKIT_API_SECRET is not set
+
     Note:
         Requires LIVEKIT_API_KEY and LIVEKIT_API_SECRET environment variables
     """
-    # Retrieve API credentials from environment
-    api_key = os.environ.get("LIVEKIT_API_KEY")
-    api_secret = os.environ.get("LIVEKIT_API_SECRET")
-
-    # Create access token with API credentials
-    token = api.AccessToken(api_key, api_secret)
-
-    # Set participant identity and display name
-    token.with_identity(participant_name)
-    token.with_name(participant_name)
-
-    # Grant room access permissions
-    token.with_grants(
-        api.VideoGrants(
-            room_join=True,  # Allow joining the room
-            room=room_name,  # Specific room name
-            can_publish=True,  # Allow publishing audio/video
-            can_subscribe=True,  # Allow subscribing to other participants
-        )
+    key = (room_name, participant_name)
+    now = time.monotonic()
+    cached = _token_cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    api_key, api_secret = get_livekit_credentials()
+    if not api_key or not api_secret:
+        raise ValueError("api_key and api_secret must be set")
+
+    # Participant identity/display name, room grant and 1 hour expiration
+    issued_at = int(time.time())
+    claims = {
+        "name": participant_name,
+        "video": {**_VIDEO_GRANT_CLAIMS, "room": room_name},
+        "sub": participant_name,
+        "iss": api_key,
+        "nbf": issued_at,
+        "exp": issued_at + _TOKEN_TTL_SECONDS,
+    }
+    # Sign header.payload with HMAC-SHA256 (HS256)
+    signing_input = (
+        _JWT_HEADER_B64
+        + b"."
+        + _b64url(json.dumps(claims, separators=(",", ":")).encode())
     )
+    signature = hmac.new(api_secret.encode(), signing_input, hashlib.sha256).digest()
+    jwt_token = (signing_input + b"." + _b64url(signature)).decode("ascii")
 
-    # Set token expiration to 1 hour
-    token.with_ttl(timedelta(hours=1))
+    # Evict expired tokens first, then the oldest one, when the cache is full
+    if key not in _token_cache and len(_token_cache) >= _TOKEN_CACHE_SIZE:
+        for stale in [k for k, (expiry, _) in _token_cache.items() if expiry <= now]:
+            del _token_cache[stale]
+        if len(_token_cache) >= _TOKEN_CACHE_SIZE:
+            del _token_cache[next(iter(_token_cache))]
+    _token_cache[key] = (now + _TOKEN_REUSE_SECONDS, jwt_token)
 
-    return token.to_jwt()
+    return jwt_token
 
 
 class SimpleLLMStream(llm.LLMStream):
     """Custom LLM stream adapter for LangGraph responses.
 
-    This class wraps pre-generated text from LangGraph into a streaming
-    format compatible with LiveKit's voice pipeline. It handles the conversion
-    of LangGraph responses (which may be strings or lists) into proper
-    ChatChunk objects for the TTS system.
+    This class streams the LangGraph response for a user message into a
+    format compatible with LiveKit's voice pipeline. Each delta produced by
+    the routed model is forwarded as its own ChatChunk, so TTS can begin
+    synthesizing while the model is still generating. Cached responses are
+    replayed through the same path without touching LangGraph.
+
+    All potentially slow work (cache lookups, LangGraph) happens in _run so
+    that creating the stream never blocks the event loop.
 
     Attributes:
-        _text: The pre-generated response text from LangGraph
+        _user_message: The user message to route through LangGraph
+        _cached_response: Response to replay instead of calling LangGraph
+        _stream_id: Id shared by every ChatChunk of this response
     """
 
     def __init__(
         self,
-        text: str,
+        user_message: str,
         llm_instance: llm.LLM,
         chat_ctx: llm.ChatContext,
         tools: list | None = None,
         conn_options: dict | None = None,
+        cached_response: str | None = None,
     ):
-        """Initialize the stream with pre-generated text.
+        """Initialize the stream for a user message.
 
         Args:
-            text: Response text from LangGraph (string or list)
+            user_message: User message to send through LangGraph
             llm_instance: Parent LLM instance (LangGraphLLMAdapter)
             chat_ctx: Chat context with conversation history
             tools: Optional tool definitions (unused in this implementation)
             conn_options: Optional connection options
+            cached_response: Response to replay instead of calling LangGraph
         """
         # Initialize parent LLMStream with required parameters
         super().__init__(
             llm=llm_instance, chat_ctx=chat_ctx, tools=tools, conn_options=conn_options
         )
-        # Store the response text for streaming
-        self._text = text
+        # Store the message; the graph is invoked lazily in _run
+        self._user_message = user_message
+        self._cached_response = cached_response
+        # All deltas of one response share an id so downstream aggregators
+        # concatenate them into a single assistant message
+        self._stream_id = uuid.uuid4().hex
 
     async def _run(self) -> None:
         """Generate and send chat chunks through the event channel.
 
-        This is the required abstract method from LLMStream. It converts
-        the pre-generated LangGraph response into a ChatChunk object and
-        sends it through the event channel for TTS processing.
+        This is the required abstract method from LLMStream. It streams the
+        LangGraph response, buffers deltas into complete sentences and sends
+        each sentence through the event channel for TTS processing.
 
         The method handles:
-        - List-to-string conversion for LangGraph list responses
-        - UUID generation for chunk identification
+        - Sentence buffering so TTS never synthesizes mid-word
+        - Model failures (ModelStreamError), spoken as a separate sentence
+          and never cached
+        - A single stream id shared by all chunks of the response
         - Proper ChatChunk structure with ChoiceDelta
         """
-        import uuid
-
-        # Convert text to string format (handle various response types from LangGraph)
-        text_content = self._text
-        if isinstance(text_content, list):
-            # LangGraph sometimes returns lists - join them into a string
-            text_content = " ".join(str(item) for item in text_content)
-        elif not isinstance(text_content, str):
-            # Convert any other type to string
-            text_content = str(text_content)
-
-        # Send the response as a single ChatChunk through the event channel
-        # This will be picked up by the TTS system for voice synthesis
-        self._event_ch.send_nowait(
-            llm.ChatChunk(
-                id=str(uuid.uuid4()),  # Unique identifier for this chunk
-                delta=llm.ChoiceDelta(content=text_content, role="assistant"),
+
+        def send(text: str) -> None:
+            # This will be picked up by the TTS system for voice synthesis
+            self._event_ch.send_nowait(
+                llm.ChatChunk(
+                    id=self._stream_id,
+                    delta=llm.ChoiceDelta(content=text, role="assistant"),
+                )
             )
-        )
+
+        # Three-tier fallthrough: exact cache -> semantic cache -> LangGraph
+        cached_response, cache_key = self._cached_response, None
+        if cached_response is None:
+            cached_response, cache_key = await self._llm.lookup(self._user_message)
+
+        if cached_response is not None:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "⚡ CACHE HIT for message: %s...", self._user_message[:100]
+                )
+            deltas = _replay(cached_response)
+        else:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "🔵 STREAMING LANGGRAPH with message: %s...",
+                    self._user_message[:100],
+                )
+            deltas = self._llm.stream_graph(self._user_message)
+
+        buf = ""
+        parts = []
+        failure = None
+        try:
+            # aclosing() releases the graph semaphore even if the stream is
+            # interrupted mid-answer
+            async with aclosing(deltas):
+                # Deltas are already plain strings (TravelAssistantGraph.astream
+                # normalizes list content at the source)
+                async for text_content in deltas:
+                    # Accumulate deltas and flush everything up to the last
+                    # sentence boundary, keeping the unfinished tail for the
+                    # next delta
+                    parts.append(text_content)
+                    buf += text_content
+                    end = 0
+                    for match in _SENTENCE_BOUNDARY_RE.finditer(buf):
+                        end = match.end()
+                    if end:
+                        send(buf[:end])
+                        buf = buf[end:]
+        except langgraph_agent.ModelStreamError as e:
+            failure = e
+
+        if failure is not None:
+            # Close off any half-finished sentence so the error is spoken on
+            # its own instead of being run into the partial answer
+            if buf:
+                send(buf.rstrip() + "... ")
+            send(str(failure))
+            # An incomplete answer must never be cached
+            return
+
+        # Flush whatever is left once the model has finished
+        if buf:
+            send(buf)
+
+        if cached_response is None:
+            await self._llm.remember(self._user_message, cache_key, "".join(parts))
+            logger.debug("🟢 LANGGRAPH STREAM FINISHED")
 
     async def aclose(self) -> None:
         """Close the stream."""
@@ -182,16 +513,93 @@ class LangGraphLLMAdapter(llm.LLM):
 
     Attributes:
         graph: TravelAssistantGraph instance for multi-model orchestration
+        exact_cache: Optional ExactResponseCache for identical repeats
+        semantic_cache: Optional SemanticResponseCache for paraphrased repeats
     """
 
-    def __init__(self, graph):
+    def __init__(self, graph, exact_cache=None, semantic_cache=None):
         """Initialize adapter with a LangGraph instance.
 
         Args:
             graph: TravelAssistantGraph instance from langgraph_agent.py
+            exact_cache: Optional ExactResponseCache from response_cache.py
+            semantic_cache: Optional SemanticResponseCache from response_cache.py
         """
         super().__init__()
         self.graph = graph
+        self.exact_cache = exact_cache
+        self.semantic_cache = semantic_cache
+        # (item count, last item id) of the last chat context seen, and the
+        # user message resolved from it
+        self._last_ctx_key = None
+        self._last_user_message = ""
+
+    async def stream_graph(self, user_message: str):
+        """Stream a LangGraph response while holding the graph semaphore.
+
+        At most LANGGRAPH_CONCURRENCY (default 4) graph calls run at once in
+        this job process, i.e. per room; further calls wait for a free slot.
+        The graph stream is closed as soon as this generator is, so an
+        interrupted answer stops the model call before the slot is released.
+
+        Args:
+            user_message: User message to route through LangGraph
+
+        Yields:
+            Response deltas produced by the routed model
+        """
+        async with _graph_semaphore():
+            async with aclosing(self.graph.astream(user_message)) as stream:
+                async for delta in stream:
+                    yield delta
+
+    async def lookup(self, user_message: str) -> tuple[str | None, object]:
+        """Look a user message up in the exact, then the semantic cache.
+
+        The semantic cache encodes the message with a CPU-bound embedding
+        model, so it runs in a worker thread to keep the event loop free. A
+        failing semantic lookup is logged and treated as a miss, so the turn
+        still reaches LangGraph.
+
+        Args:
+            user_message: User message to look up
+
+        Returns:
+            tuple: (cached response or None, semantic embedding or None)
+        """
+        if self.exact_cache is not None:
+            cached_response = self.exact_cache.get(user_message)
+            if cached_response is not None:
+                # Identical repeats never pay for the embedding model
+                return cached_response, None
+
+        if self.semantic_cache is not None:
+            try:
+                return await asyncio.to_thread(
+                    self.semantic_cache.lookup, user_message
+                )
+            except Exception as e:
+                logger.warning("⚠️ Semantic cache lookup failed: %s", e)
+
+        return None, None
+
+    async def remember(self, user_message: str, cache_key, response: str) -> None:
+        """Store a completed LangGraph response in the response caches.
+
+        Args:
+            user_message: User message the response answers
+            cache_key: Semantic embedding of the user message (None if unused)
+            response: Full response text produced by LangGraph
+        """
+        # Failed streams never get here (_run returns early), so only an
+        # empty answer needs skipping
+        if not response:
+            return
+        if self.exact_cache is not None:
+            self.exact_cache.put(user_message, response)
+        if self.semantic_cache is not None and cache_key is not None:
+            # Adding may persist the index to disk - keep that off the loop
+            await asyncio.to_thread(self.semantic_cache.add, cache_key, response)
 
     def chat(
         self,
@@ -206,8 +614,13 @@ class LangGraphLLMAdapter(llm.LLM):
 
         This is the main method called by LiveKit's voice pipeline. It:
         1. Extracts the user's message from the chat context
-        2. Routes it through LangGraph's multi-model system
-        3. Returns a SimpleLLMStream for TTS processing
+        2. Answers trivial utterances (greetings, thanks) from a canned table
+        3. Otherwise returns a SimpleLLMStream that looks the message up in
+           the exact, then the semantic cache, and otherwise routes it
+           through LangGraph's multi-model system, streaming the answer for TTS
+
+        chat() itself never blocks; cache lookups and model calls run inside
+        the stream.
 
         Args:
             chat_ctx: Conversation context containing message history
@@ -217,37 +630,21 @@ class LangGraphLLMAdapter(llm.LLM):
             **kwargs: Additional arguments (unused)
 
         Returns:
-            SimpleLLMStream: Stream object containing LangGraph's response
+            SimpleLLMStream: Stream object producing LangGraph's response
         """
         # Extract the most recent user message from chat context
-        # We search in reverse order to get the latest message
-        user_message = ""
-        for item in reversed(chat_ctx.items):
-            if item.role == "user":
-                # Handle different content formats from LiveKit
-                if isinstance(item.content, str):
-                    # Simple string content
-                    user_message = item.content
-                elif isinstance(item.content, list):
-                    # Content as list of parts (multimodal format)
-                    for part in item.content:
-                        if isinstance(part, dict) and part.get("type") == "text":
-                            # Extract text from dictionary format
-                            user_message = part.get("text", "")
-                            break
-                        elif isinstance(part, str):
-                            # Direct string in list
-                            user_message = part
-                            break
-                    if not user_message:
-                        # Fallback: join all string parts
-                        user_message = " ".join(
-                            str(p) for p in item.content if isinstance(p, str)
-                        )
-                else:
-                    # Fallback: convert to string
-                    user_message = str(item.content)
-                break
+        # LiveKit passes a fresh copy of the context on every generation, so
+        # the resolved message is memoized on the adapter, keyed on the
+        # context tail - unchanged contexts (retries, preemptive generation)
+        # skip re-parsing
+        items = chat_ctx.items
+        ctx_key = (len(items), items[-1].id) if items else None
+        if ctx_key is not None and ctx_key == self._last_ctx_key:
+            user_message = self._last_user_message
+        else:
+            user_message = _latest_user_message(items)
+            self._last_ctx_key = ctx_key
+            self._last_user_message = user_message
 
         # Fallback if no user message found in context
         if not user_message:
@@ -256,43 +653,126 @@ class LangGraphLLMAdapter(llm.LLM):
         # Ensure message is a string
         user_message = str(user_message)
 
-        # Route the message through LangGraph for multi-model processing
-        # LangGraph will select Gemini Flash or Pro based on query complexity
-        print(f"\n🔵 CALLING LANGGRAPH with message: {user_message[:100]}...")
-        langgraph_response = self.graph.invoke(user_message)
-        print(
-            f"🟢 LANGGRAPH RESPONSE (length={len(langgraph_response)}): {langgraph_response[:200]}...\n"
-        )
+        # Answer filler utterances ("hello", "thanks") without LangGraph
+        canned = _canned_response(user_message)
+        if canned is not None:
+            return SimpleLLMStream(
+                user_message,
+                self,
+                chat_ctx,
+                tools,
+                conn_options,
+                cached_response=canned,
+            )
+
+        # Stream the message through LangGraph for multi-model processing
+        # LangGraph will select Gemini Flash or Pro based on query complexity;
+        # caches and the graph are only consulted once the stream starts running
+        return SimpleLLMStream(user_message, self, chat_ctx, tools, conn_options)
+
+
+# ============================================================================
+# Shared Pipeline Components
+# ============================================================================
+# The VAD model and the response caches below are loaded once per process and
+# reused by every session. STT and TTS are created per session: the OpenAI
+# plugins bind an httpx client to the event loop that created it, and with the
+# THREAD executor each job runs its own loop. Per-session conversation state
+# lives in the TravelAssistantGraph each create_langgraph_adapter() call
+# builds; the graphs themselves share the Gemini clients
+# (langgraph_agent._shared_models()).
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_vad() -> silero.VAD:
+    """Load the Silero VAD ONNX model once per process.
+
+    Each worker keeps exactly one ONNX Runtime session. The ~2 MB model file
+    is read through the OS page cache, which is already shared between
+    worker processes, so it is not copied into shared memory explicitly
+    (the plugin only accepts a file path, not preloaded bytes).
+    """
+    return silero.VAD.load()
+
+
+def create_tts(backend: str | None = None) -> TTS:
+    """Create the text-to-speech engine for the voice pipeline.
+
+    Supported backends (selected by argument or the TTS_BACKEND env var):
+    - "openai" (default): OpenAI gpt-4o-mini-tts returning raw PCM, which
+      plays as soon as bytes arrive instead of waiting on mp3 decoding
+    - "cartesia": Cartesia streaming TTS over a websocket, synthesizing
+      frames while LLM text is still arriving (requires the optional
+      livekit-plugins-cartesia package and CARTESIA_API_KEY)
+
+    Args:
+        backend: Backend name; defaults to TTS_BACKEND or "openai"
 
-        # Wrap the LangGraph response in a SimpleLLMStream for voice output
-        # This stream will be processed by the TTS system
-        print("🎤 Creating SimpleLLMStream with LangGraph response...")
-        return SimpleLLMStream(langgraph_response, self, chat_ctx, tools, conn_options)
+    Returns:
+        TTS: Configured LiveKit TTS engine
+
+    Raises:
+        ValueError: If the backend is unknown or its plugin is not installed
+    """
+    env_boot.boot()
+    backend = (backend or os.environ.get("TTS_BACKEND", "openai")).lower()
+
+    if backend == "openai":
+        return openai.TTS(model="gpt-4o-mini-tts", response_format="pcm")
+
+    if backend == "cartesia":
+        try:
+            from livekit.plugins import cartesia
+        except ImportError:
+            raise ValueError(
+                "TTS_BACKEND=cartesia requires livekit-plugins-cartesia"
+            ) from None
+        return cartesia.TTS()
+
+    raise ValueError(f"Unsupported TTS_BACKEND: {backend}")
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_response_caches() -> tuple:
+    """Create the exact and semantic response caches once per process."""
+    # Semantic cache is None when its optional dependencies are missing
+    return ExactResponseCache(), create_semantic_cache()
 
 
 def create_langgraph_adapter():
     """Create and initialize the LangGraph LLM adapter.
 
-    Factory function that creates a TravelAssistantGraph instance
-    and wraps it in a LangGraphLLMAdapter for use in the voice pipeline.
+    Factory function that wraps a new TravelAssistantGraph and the
+    process-wide response caches (exact LRU plus the optional semantic
+    cache) in a LangGraphLLMAdapter for use in the voice pipeline. Each
+    adapter gets its own graph, so conversation history and the graph's
+    response memo are never shared between sessions; the Gemini clients
+    behind the graphs are.
 
     Returns:
         LangGraphLLMAdapter: Configured adapter ready for voice agent
     """
-    # Create LangGraph instance with multi-model routing
-    graph = create_graph()
+    # Per-session LangGraph instance with multi-model routing
+    graph = langgraph_agent.create_graph()
+    exact_cache, semantic_cache = _shared_response_caches()
     # Wrap in adapter for LiveKit compatibility
-    return LangGraphLLMAdapter(graph)
+    return LangGraphLLMAdapter(graph, exact_cache, semantic_cache)
 
 
-def create_voice_agent() -> Agent:
+def create_voice_agent(tts: TTS | None = None) -> Agent:
     """Create and configure the complete voice pipeline agent.
 
     Assembles the full voice agent with:
     - VAD (Voice Activity Detection): Detects when user is speaking
     - STT (Speech-to-Text): Converts speech to text using OpenAI Whisper
     - LLM: Routes queries through LangGraph multi-model system
-    - TTS (Text-to-Speech): Converts responses to speech using OpenAI TTS
+    - TTS (Text-to-Speech): Converts responses to speech (see create_tts)
+
+    VAD, the Gemini clients and the response caches are shared by all
+    sessions in the process; the graph, STT and TTS are created per session.
+
+    Args:
+        tts: Optional TTS engine overriding the TTS_BACKEND engine
 
     Returns:
         Agent: Configured LiveKit voice agent ready for sessions
@@ -302,10 +782,10 @@ def create_voice_agent() -> Agent:
 
     # Assemble complete voice pipeline
     return Agent(
-        vad=silero.VAD.load(),  # Silero VAD for voice activity detection
+        vad=_shared_vad(),  # Silero VAD for voice activity detection
         stt=openai.STT(),  # OpenAI Whisper for speech recognition
         llm=langgraph_llm,  # LangGraph multi-model system
-        tts=openai.TTS(),  # OpenAI TTS for voice synthesis
+        tts=tts or create_tts(),  # TTS engine for voice synthesis
         instructions="You are a travel assistant. Keep responses brief and conversational.",
     )
 
@@ -319,6 +799,37 @@ def create_voice_agent() -> Agent:
 server = AgentServer()
 
 
+def prewarm(proc: JobProcess):
+    """Load heavyweight components once per worker process.
+
+    LiveKit runs this before the process accepts a room, so the caller does
+    not pay for loading the VAD model and the LangChain/Gemini imports
+    inside their time-to-first-audio budget. No model call is made here;
+    each process serves a single job, so a warm-up query would be one extra
+    paid request per room.
+
+    The response caches are left to be built on first use: the semantic
+    cache loads a sentence-transformer model (torch import, hub lookup and
+    a download on first run), which does not reliably fit in LiveKit's
+    default 10 second initialize_process_timeout.
+
+    Args:
+        proc: Job process being prepared (components are kept in the
+              process-wide singletons used by create_voice_agent(), not in
+              proc.userdata)
+    """
+    # Load environment variables from .env file
+    env_boot.boot()
+
+    # Populate the process-wide singletons used by create_voice_agent()
+    _shared_vad()
+    langgraph_agent._shared_models()
+    logger.info("✓ Worker prewarmed")
+
+
+server.setup_fnc = prewarm
+
+
 @server.rtc_session(agent_name="test-assistant-travel")
 async def entrypoint(ctx: JobContext):
     """Main entry point when agent is assigned to a room.
@@ -332,22 +843,40 @@ async def entrypoint(ctx: JobContext):
     Args:
         ctx: Job context containing room information and connection details
     """
-    print(f"🔥 Agent received job for room: {ctx.room.name}")
+    logger.info("🔥 Agent received job for room: %s", ctx.room.name)
+
+    # Build the response caches in a worker thread while connecting: the
+    # semantic cache loads a sentence-transformer model, which would block
+    # the event loop for seconds (job processes are never reused, so this
+    # runs for every room)
+    caches = asyncio.create_task(asyncio.to_thread(_shared_response_caches))
 
     # Connect to the LiveKit room (audio only, no video)
     await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
-    print(f"✅ Connected to room: {ctx.room.name}")
+    logger.info("✅ Connected to room: %s", ctx.room.name)
+
+    _, semantic_cache = await caches
 
     # Create the voice agent with full pipeline (VAD -> STT -> LLM -> TTS)
-    print("🔧 Creating voice agent...")
+    # VAD and Gemini clients were preloaded by prewarm(); the response
+    # caches were built above, so create_voice_agent() reuses them
+    logger.info("🔧 Creating voice agent...")
     assistant = create_voice_agent()
-    print("✓ Voice agent created")
+    logger.info("✓ Voice agent created")
+
+    # Semantic cache saves are batched; flush the remainder when the job ends
+    if semantic_cache is not None:
+
+        async def _flush_semantic_cache():
+            await asyncio.to_thread(semantic_cache.save)
+
+        ctx.add_shutdown_callback(_flush_semantic_cache)
 
     # Start the agent session to begin handling voice interactions
     session = AgentSession()
-    print("🚀 Starting session...")
+    logger.info("🚀 Starting session...")
     await session.start(assistant, room=ctx.room)
-    print("✓ Session started")
+    logger.info("✓ Session started")
 
 
 if __name__ == "__main__":
@@ -355,4 +884,6 @@ if __name__ == "__main__":
     # This handles command line arguments and server lifecycle
     # Usage: python agent.py dev (for development with auto-reload)
     #        python agent.py start (for production)
+    # The CLI reads LIVEKIT_URL and the API credentials, so load .env first
+    env_boot.boot()
     cli.run_app(server)
@@ -0,0 +1,28 @@
+"""
+Process-wide .env loading.
+
+agent.py, langgraph_agent.py and response_cache.py need the variables from
+.env before they read their configuration. Rather than calling load_dotenv()
+as an import side effect, each configuration accessor (get_livekit_url(),
+get_google_api_key(), create_tts(), create_semantic_cache(), prewarm(), ...)
+calls boot() first, so merely importing a module never touches the
+filesystem and the file is located and parsed at most once per process.
+"""
+
+from dotenv import load_dotenv
+
+# Whether .env has already been loaded in this process
+_LOADED = False
+
+
+def boot() -> None:
+    """Load environment variables from .env, once per process.
+
+    Variables already set in the environment are not overridden, matching
+    load_dotenv()'s default behavior.
+    """
+    global _LOADED
+    if _LOADED:
+        return
+    load_dotenv()
+    _LOADED = True
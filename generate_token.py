@@ -21,16 +21,42 @@ Note:
     environment variables to be set in .env file.
 """
 
-import os
 import asyncio
-from dotenv import load_dotenv
+import concurrent.futures
 from livekit import api
 
 # Import token generation and URL utilities from agent.py
-from agent import generate_token, get_livekit_url
+from agent import generate_token, get_livekit_credentials, get_livekit_url
 
-# Load environment variables from .env file
-load_dotenv()
+# Event loop reused by _run_sync() across calls from synchronous code
+_loop = None
+
+
+def _run_sync(coro):
+    """Run a coroutine to completion from synchronous code.
+
+    Unlike asyncio.run(), the event loop is created once and reused by later
+    calls instead of being set up and torn down each time. When called from
+    inside a running event loop (e.g. a notebook or another async host),
+    where run_until_complete() would fail, the coroutine is run on its own
+    loop in a worker thread instead.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    global _loop
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+        return _loop.run_until_complete(coro)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
 
 
 async def dispatch_agent_to_room(room_name: str = None):
@@ -59,41 +85,41 @@ async def dispatch_agent_to_room(room_name: str = None):
 
     # Get LiveKit server URL and API credentials
     url = get_livekit_url()
-    api_key = os.environ.get("LIVEKIT_API_KEY")
-    api_secret = os.environ.get("LIVEKIT_API_SECRET")
-
-    # Create LiveKit API client for room and agent management
-    livekit_api = api.LiveKitAPI(url, api_key, api_secret)
+    api_key, api_secret = get_livekit_credentials()
 
-    try:
+    # Create LiveKit API client for room and agent management; both requests
+    # share its HTTP session and the context manager closes it on exit
+    async with api.LiveKitAPI(url, api_key, api_secret) as livekit_api:
         # Step 1: Create a new room (or use existing room with same name)
-        try:
-            await livekit_api.room.create_room(api.CreateRoomRequest(name=room_name))
-            print(f"✓ Room created: {room_name}")
-        except Exception:
-            # Room already exists - that's fine, we'll use it
-            print(f"✓ Using existing room: {room_name}")
-
         # Step 2: Dispatch the agent to the room
         # This tells LiveKit to assign our running agent to handle this room
         # The agent_name must match the name registered in agent.py
-        await livekit_api.agent_dispatch.create_dispatch(
-            api.CreateAgentDispatchRequest(
-                room=room_name,
-                agent_name="test-assistant-travel",  # Must match @server.rtc_session decorator
-            )
+        # Both requests are sent concurrently: dispatching does not need to
+        # wait for the room, so this costs one round trip instead of two
+        room_result, dispatch_result = await asyncio.gather(
+            livekit_api.room.create_room(api.CreateRoomRequest(name=room_name)),
+            livekit_api.agent_dispatch.create_dispatch(
+                api.CreateAgentDispatchRequest(
+                    room=room_name,
+                    agent_name="test-assistant-travel",  # Must match @server.rtc_session decorator
+                )
+            ),
+            return_exceptions=True,
         )
+
+        if isinstance(room_result, Exception):
+            # Room already exists - that's fine, we'll use it
+            print(f"✓ Using existing room: {room_name}")
+        else:
+            print(f"✓ Room created: {room_name}")
+
+        if isinstance(dispatch_result, Exception):
+            print(f"✗ Failed to dispatch agent: {dispatch_result}")
+            raise dispatch_result
         print(f"✓ Agent dispatched to room: {room_name}")
 
         return room_name  # Return room name for token generation
 
-    except Exception as e:
-        print(f"✗ Failed to dispatch agent: {e}")
-        raise
-    finally:
-        # Clean up API client
-        await livekit_api.aclose()
-
 
 def print_playground_instructions(
     room_name: str = None, participant_name: str = "user-1"
@@ -117,7 +143,7 @@ def print_playground_instructions(
         Run: python3 agent.py dev
     """
     # Step 1: Create room and dispatch agent
-    room_name = asyncio.run(dispatch_agent_to_room(room_name))
+    room_name = _run_sync(dispatch_agent_to_room(room_name))
 
     # Step 2: Generate access token for user to join the room
     jwt_token = generate_token(room_name, participant_name)
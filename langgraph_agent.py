@@ -12,7 +12,7 @@ Architecture:
     1. Query Classification: Heuristics identify query type (simple/complex/technical/creative)
     2. Model Selection: Router chooses optimal model based on classification
     3. Response Generation: Selected model processes query and returns response
-    4. Conversation History: All interactions are logged with model attribution
+    4. Conversation History: Recent turns are kept with model attribution
 
 Models Used:
     - Gemini 2.5 Flash: Fast, efficient for simple factual queries
@@ -23,13 +23,31 @@ Integration:
     - Provides create_graph() entry point for LiveKit integration
 """
 
+import asyncio
+import functools
+import logging
 import os
-from typing import Dict, Any
-from dotenv import load_dotenv
+import re
+import sys
+from collections import OrderedDict, deque
+from enum import IntEnum
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, FrozenSet, NamedTuple, Optional, Tuple
+import env_boot
 from langchain_google_genai import ChatGoogleGenerativeAI
 
-# Load environment variables
-load_dotenv()
+logger = logging.getLogger("langgraph_agent")
+
+# Prefix of the text returned in place of a response when a model call fails
+MODEL_ERROR_PREFIX = "Error calling model: "
+
+
+class ModelStreamError(Exception):
+    """Raised by TravelAssistantGraph.astream() when the model call fails.
+
+    The message is the user-facing error text (MODEL_ERROR_PREFIX plus the
+    underlying error); the original exception is chained as __cause__.
+    """
 
 
 # ============================================================================
@@ -37,6 +55,18 @@ load_dotenv()
 # ============================================================================
 
 
+@functools.lru_cache(maxsize=1)
+def get_google_api_key() -> Optional[str]:
+    """Retrieve the Google API key, reading the environment only once.
+
+    Returns:
+        str or None: Value of GOOGLE_API_KEY, None if it is not set
+    """
+    # Load environment variables
+    env_boot.boot()
+    return os.getenv("GOOGLE_API_KEY")
+
+
 def setup_models():
     """Initialize and configure all LLM models for multi-model routing.
 
@@ -56,7 +86,7 @@ def setup_models():
         System messages are converted to human format for Gemini compatibility.
     """
     # Retrieve Google API key from environment
-    api_key = os.getenv("GOOGLE_API_KEY")
+    api_key = get_google_api_key()
 
     if not api_key:
         raise ValueError("GOOGLE_API_KEY environment variable is required")
@@ -82,10 +112,202 @@ def setup_models():
     return models
 
 
+@functools.lru_cache(maxsize=1)
+def _shared_models():
+    """Return the process-wide models, creating them on first use.
+
+    Every TravelAssistantGraph shares these instances, so the Gemini clients
+    (and their connections) are built once per process instead of once per
+    create_graph() call.
+    """
+    return setup_models()
+
+
 # ============================================================================
 # Query Classification Heuristics
 # ============================================================================
 
+# Patterns indicating simple factual questions
+SIMPLE_PATTERNS = (
+    "what is",
+    "who is",
+    "when is",
+    "where is",
+    "what's",
+    "who's",
+    "when's",
+    "where's",
+    "define",
+    "meaning of",
+    "capital of",
+    "how many",
+    "how much",
+    "how old",
+)
+
+# Keywords indicating need for deep reasoning or analysis
+COMPLEX_INDICATORS = (
+    "explain",  # Requests for explanations
+    "why",  # Causal reasoning
+    "how does",  # Process understanding
+    "how do",
+    "reasoning",  # Explicit reasoning request
+    "step by step",  # Detailed procedures
+    "analyze",  # Analytical thinking
+    "compare",  # Comparative analysis
+    "contrast",
+    "differences between",
+    "relationship between",
+    "implications",  # Understanding consequences
+    "consequences",
+    "effect of",
+)
+
+CREATIVE_KEYWORDS = (
+    "write a story",
+    "poem",
+    "creative",
+    "imagine",
+    "compose",
+    "draft",
+    "marketing",
+    "slogan",
+    "brainstorm",
+    "design",
+    "invent",
+)
+
+TECHNICAL_KEYWORDS = (
+    "code",
+    "python",
+    "javascript",
+    "function",
+    "algorithm",
+    "implement",
+    "debug",
+    "sql",
+    "api",
+    "class",
+    "programming",
+    "software",
+    "developer",
+    "technical",
+)
+
+# Simple queries are typically concise (8 words or fewer)
+MAX_SIMPLE_WORDS = 8
+
+
+class Category(IntEnum):
+    """Routing category of a query, in priority order (lowest value wins)."""
+
+    SIMPLE = 0
+    COMPLEX = 1
+    TECHNICAL = 2
+    CREATIVE = 3
+    GENERAL = 4  # No pattern matched
+
+
+# Patterns identifying each category
+CATEGORY_PATTERNS = {
+    Category.SIMPLE: SIMPLE_PATTERNS,
+    Category.COMPLEX: COMPLEX_INDICATORS,
+    Category.TECHNICAL: TECHNICAL_KEYWORDS,
+    Category.CREATIVE: CREATIVE_KEYWORDS,
+}
+
+# All category patterns compiled into one alternation with a named group per
+# category. The alternation sits inside a lookahead so that finditer() tries
+# every position of the query, reporting overlapping keywords exactly like
+# the original substring tests did. Matching is case-insensitive, so queries
+# are searched as-is without building a lowercased copy first.
+_CATEGORY_RE = re.compile(
+    "(?=(?:"
+    + "|".join(
+        f"(?P<{category.name}>{'|'.join(map(re.escape, patterns))})"
+        for category, patterns in CATEGORY_PATTERNS.items()
+    )
+    + "))",
+    re.IGNORECASE,
+)
+
+# Simple patterns are usually the opening words of the query ("what is",
+# "define", "how many"), so checking the first one or two words against this
+# set settles most simple queries without scanning the whole text
+_SIMPLE_LEADS = frozenset(SIMPLE_PATTERNS)
+
+
+_WORD_RE = re.compile(r"\S+")
+
+
+def _has_few_words(text: str, limit: int = MAX_SIMPLE_WORDS) -> bool:
+    """Check whether text has at most `limit` words.
+
+    Equivalent to len(text.split()) <= limit, but stops after limit + 1
+    words instead of materializing the word list of a long query.
+    """
+    return sum(1 for _ in islice(_WORD_RE.finditer(text), limit + 1)) <= limit
+
+
+def _has_simple_lead(text: str) -> bool:
+    """Check whether a query starts with a simple pattern, ignoring case."""
+    tokens = text.split(None, 2)
+    if not tokens:
+        return False
+    first = tokens[0].lower()
+    if first in _SIMPLE_LEADS:
+        return True
+    if len(tokens) < 2:
+        return False
+    # The pair must appear verbatim (single space) to count as a pattern match
+    lead = f"{first} {tokens[1].lower()}"
+    return lead in _SIMPLE_LEADS and text.lstrip()[: len(lead)].lower() == lead
+
+
+def query_categories(text: str) -> FrozenSet[Category]:
+    """Find every category whose patterns occur in a query.
+
+    All patterns are matched in a single pass of the precompiled
+    _CATEGORY_RE instead of one substring scan per pattern.
+
+    Args:
+        text: User query text
+
+    Returns:
+        frozenset: The matching categories (never Category.GENERAL)
+    """
+    return frozenset(Category[match.lastgroup] for match in _CATEGORY_RE.finditer(text))
+
+
+def classify(text: str) -> Category:
+    """Classify a query into its routing category.
+
+    A query is simple only if it matches a simple pattern and is 8 words or
+    fewer; otherwise the highest-priority matching category wins.
+
+    Args:
+        text: User query text
+
+    Returns:
+        Category: The routing category, Category.GENERAL if nothing matched
+
+    Examples:
+        - "What is the capital of France?" -> Category.SIMPLE
+        - "Explain how machine learning works" -> Category.COMPLEX
+        - "Tell me about Paris" -> Category.GENERAL
+    """
+    # Fast path: a short query opening with a simple pattern is simple no
+    # matter what else it contains
+    if _has_simple_lead(text) and _has_few_words(text):
+        return Category.SIMPLE
+
+    found = query_categories(text)
+    if Category.SIMPLE in found:
+        if _has_few_words(text):
+            return Category.SIMPLE
+        found = found - {Category.SIMPLE}
+    return min(found, default=Category.GENERAL)
+
 
 def is_simple_query(text: str) -> bool:
     """Detect if a query is simple/factual requiring fast response.
@@ -108,31 +330,7 @@ def is_simple_query(text: str) -> bool:
         - "How many continents are there?" -> True
         - "Explain quantum mechanics" -> False
     """
-    text_lower = text.lower().strip()
-
-    # Simple queries are typically concise (8 words or fewer)
-    if len(text.split()) <= 8:
-        # Patterns indicating simple factual questions
-        simple_patterns = [
-            "what is",
-            "who is",
-            "when is",
-            "where is",
-            "what's",
-            "who's",
-            "when's",
-            "where's",
-            "define",
-            "meaning of",
-            "capital of",
-            "how many",
-            "how much",
-            "how old",
-        ]
-        if any(pattern in text_lower for pattern in simple_patterns):
-            return True
-
-    return False
+    return classify(text) is Category.SIMPLE
 
 
 def is_complex_query(text: str) -> bool:
@@ -158,72 +356,17 @@ def is_complex_query(text: str) -> bool:
         - "Compare Python and JavaScript" -> True
         - "What is Python?" -> False
     """
-    text_lower = text.lower().strip()
-
-    # Keywords indicating need for deep reasoning or analysis
-    complex_indicators = [
-        "explain",  # Requests for explanations
-        "why",  # Causal reasoning
-        "how does",  # Process understanding
-        "how do",
-        "reasoning",  # Explicit reasoning request
-        "step by step",  # Detailed procedures
-        "analyze",  # Analytical thinking
-        "compare",  # Comparative analysis
-        "contrast",
-        "differences between",
-        "relationship between",
-        "implications",  # Understanding consequences
-        "consequences",
-        "effect of",
-    ]
-
-    return any(indicator in text_lower for indicator in complex_indicators)
+    return Category.COMPLEX in query_categories(text)
 
 
 def is_creative_query(text: str) -> bool:
     """Detect if a query requires creative output."""
-    text_lower = text.lower().strip()
-
-    creative_keywords = [
-        "write a story",
-        "poem",
-        "creative",
-        "imagine",
-        "compose",
-        "draft",
-        "marketing",
-        "slogan",
-        "brainstorm",
-        "design",
-        "invent",
-    ]
-
-    return any(keyword in text_lower for keyword in creative_keywords)
+    return Category.CREATIVE in query_categories(text)
 
 
 def is_technical_query(text: str) -> bool:
     """Detect if a query is technical/coding related."""
-    text_lower = text.lower().strip()
-
-    technical_keywords = [
-        "code",
-        "python",
-        "javascript",
-        "function",
-        "algorithm",
-        "implement",
-        "debug",
-        "sql",
-        "api",
-        "class",
-        "programming",
-        "software",
-        "developer",
-        "technical",
-    ]
-
-    return any(keyword in text_lower for keyword in technical_keywords)
+    return Category.TECHNICAL in query_categories(text)
 
 
 # ============================================================================
@@ -231,6 +374,87 @@ def is_technical_query(text: str) -> bool:
 # ============================================================================
 
 
+def content_to_text(content: Any) -> str:
+    """Convert model message content into plain text.
+
+    LangChain chat models usually return a string, but may return a list of
+    content parts; lists are joined with spaces and anything else is
+    converted with str().
+
+    Args:
+        content: The content of a model message or message chunk
+
+    Returns:
+        str: Text form of the content
+    """
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(str(item) for item in content)
+    return str(content)
+
+
+def response_text_of(response: Any) -> Any:
+    """Return the content of a model response.
+
+    Chat models return an AIMessage, whose content is used as-is; anything
+    without a content attribute is converted with str(). A single getattr()
+    lookup replaces the hasattr() check plus attribute access.
+
+    Args:
+        response: Result of a model invoke()/ainvoke() call
+
+    Returns:
+        The message content (usually str), or str(response)
+    """
+    content = getattr(response, "content", None)
+    return content if content is not None else str(response)
+
+
+# Routing reasons, interned once so every turn shares the same string
+# objects and comparisons against them can short-circuit on identity
+REASON_SIMPLE = sys.intern("Simple factual query - using fast Gemini 2.5 Flash")
+REASON_COMPLEX = sys.intern("Complex reasoning query - using Gemini 2.5 Pro")
+REASON_TECHNICAL = sys.intern("Technical/coding query - using Gemini 2.5 Pro")
+REASON_CREATIVE = sys.intern("Creative query - using Gemini 2.5 Pro")
+REASON_GENERAL = sys.intern("General query - using Gemini 2.5 Flash")
+
+# Model and reason used for each routing category
+_ROUTING = {
+    Category.SIMPLE: ("gemini_25_flash", REASON_SIMPLE),
+    Category.COMPLEX: ("gemini_25_pro", REASON_COMPLEX),
+    Category.TECHNICAL: ("gemini_25_pro", REASON_TECHNICAL),
+    Category.CREATIVE: ("gemini_25_pro", REASON_CREATIVE),
+    # Default to flash for general queries
+    Category.GENERAL: ("gemini_25_flash", REASON_GENERAL),
+}
+
+
+def select_model(user_query: str) -> Tuple[str, str]:
+    """
+    Choose the best single model for a query based on heuristics.
+
+    Args:
+        user_query: The user's input query
+
+    Returns:
+        tuple: (chosen_model_name, reason)
+    """
+    # Determine which model to use based on query characteristics
+    chosen_model_name, reason = _ROUTING[classify(user_query)]
+
+    # Log model selection
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "🤖 MODEL ROUTING: %s -> %s (%s)",
+            user_query[:100],
+            chosen_model_name.upper(),
+            reason,
+        )
+
+    return chosen_model_name, reason
+
+
 def route_query(user_query: str, models: Dict[str, Any]) -> Dict[str, Any]:
     """
     Route query to the best single model based on heuristics.
@@ -245,44 +469,60 @@ def route_query(user_query: str, models: Dict[str, Any]) -> Dict[str, Any]:
         - reason: str (explanation for model choice)
         - response: str (model's answer)
     """
-    # Determine which model to use based on query characteristics
-    if is_simple_query(user_query):
-        chosen_model_name = "gemini_25_flash"
-        reason = "Simple factual query - using fast Gemini 2.5 Flash"
-    elif is_complex_query(user_query):
-        chosen_model_name = "gemini_25_pro"
-        reason = "Complex reasoning query - using Gemini 2.5 Pro"
-    elif is_technical_query(user_query):
-        chosen_model_name = "gemini_25_pro"
-        reason = "Technical/coding query - using Gemini 2.5 Pro"
-    elif is_creative_query(user_query):
-        chosen_model_name = "gemini_25_pro"
-        reason = "Creative query - using Gemini 2.5 Pro"
-    else:
-        # Default to flash for general queries
-        chosen_model_name = "gemini_25_flash"
-        reason = "General query - using Gemini 2.5 Flash"
-
-    # Log model selection
-    print("🤖 MODEL ROUTING:")
-    print(f"   Query: {user_query[:100]}...")
-    print(f"   Selected: {chosen_model_name.upper()}")
-    print(f"   Reason: {reason}")
+    chosen_model_name, reason = select_model(user_query)
 
     # Get the chosen model
     chosen_model = models[chosen_model_name]
 
     # Call the model
     try:
-        print(f"📞 CALLING {chosen_model_name}...")
+        logger.debug("📞 CALLING %s...", chosen_model_name)
         response = chosen_model.invoke(user_query)
-        response_text = (
-            response.content if hasattr(response, "content") else str(response)
+        response_text = response_text_of(response)
+        logger.debug(
+            "✅ %s RESPONDED (length=%d)", chosen_model_name, len(response_text)
         )
-        print(f"✅ {chosen_model_name} RESPONDED (length={len(response_text)})")
     except Exception as e:
-        print(f"❌ ERROR from {chosen_model_name}: {str(e)}")
-        response_text = f"Error calling model: {str(e)}"
+        logger.error("❌ ERROR from %s: %s", chosen_model_name, e)
+        response_text = f"{MODEL_ERROR_PREFIX}{str(e)}"
+
+    return {
+        "chosen_model": chosen_model_name,
+        "reason": reason,
+        "response": response_text,
+    }
+
+
+async def route_query_async(user_query: str, models: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Asynchronous version of route_query().
+
+    The chosen model is called with ainvoke(), so the event loop keeps
+    running (e.g. LiveKit audio processing) while waiting for Gemini.
+
+    Args:
+        user_query: The user's input query
+        models: Dictionary of initialized LLM models
+
+    Returns:
+        dict: Same keys as route_query()
+    """
+    chosen_model_name, reason = select_model(user_query)
+
+    # Get the chosen model
+    chosen_model = models[chosen_model_name]
+
+    # Call the model without blocking the event loop
+    try:
+        logger.debug("📞 CALLING %s...", chosen_model_name)
+        response = await chosen_model.ainvoke(user_query)
+        response_text = response_text_of(response)
+        logger.debug(
+            "✅ %s RESPONDED (length=%d)", chosen_model_name, len(response_text)
+        )
+    except Exception as e:
+        logger.error("❌ ERROR from %s: %s", chosen_model_name, e)
+        response_text = f"{MODEL_ERROR_PREFIX}{str(e)}"
 
     return {
         "chosen_model": chosen_model_name,
@@ -295,6 +535,20 @@ def route_query(user_query: str, models: Dict[str, Any]) -> Dict[str, Any]:
 # Graph Interface (Required by Assignment)
 # ============================================================================
 
+# Number of most recent turns kept in TravelAssistantGraph.conversation_history
+HISTORY_SIZE = 200
+
+# Number of routed responses remembered by invoke()/ainvoke() per graph
+RESPONSE_CACHE_SIZE = 256
+
+
+class Turn(NamedTuple):
+    """One routed turn of the conversation history."""
+
+    user: str  # The user's message/query
+    model: str  # Name of the model that answered
+    reason: str  # Why the router chose that model
+
 
 class TravelAssistantGraph:
     """
@@ -303,48 +557,129 @@ class TravelAssistantGraph:
     """
 
     def __init__(self):
-        """Initialize the graph with models."""
-        self.models = setup_models()
-        self.conversation_history = []
+        """Initialize the graph with the shared models."""
+        self.models = _shared_models()
+        # Bounded so long-running sessions keep a fixed memory footprint;
+        # responses are not kept, only the routing decision for each turn
+        self.conversation_history: deque[Turn] = deque(maxlen=HISTORY_SIZE)
+        # route_query() results of earlier calls, keyed on the user input;
+        # routing is deterministic so the input also determines the model
+        self._responses: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 
     def invoke(self, user_input: str) -> str:
         """
         Process user input through the graph and return a response.
 
+        Responses are remembered per graph, so repeating an input skips both
+        routing and the model call; call clear_cache() to reset.
+
         Args:
             user_input: The user's message/query
 
         Returns:
             str: The agent's response
         """
-        print("\n" + "=" * 70)
-        print("🔷 LANGGRAPH INVOKE STARTED")
-        print("=" * 70)
+        logger.debug("🔷 LANGGRAPH INVOKE STARTED")
 
-        # Route the query to the appropriate model
-        result = route_query(user_input, self.models)
+        # Route the query to the appropriate model, unless it was just asked
+        result = self._cached_result(user_input)
+        if result is None:
+            result = route_query(user_input, self.models)
+            self._cache_result(user_input, result)
 
         # Store in conversation history
-        self.conversation_history.append(
-            {
-                "user": user_input,
-                "assistant": result["response"],
-                "model": result["chosen_model"],
-                "reason": result["reason"],
-            }
-        )
+        self._record(user_input, result["chosen_model"], result["reason"])
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "🔶 FINAL RESULT: Using %s - %s...",
+                result["chosen_model"].upper(),
+                result["response"][:100],
+            )
+
+        return result["response"]
 
-        print("=" * 70)
-        print(f"🔶 FINAL RESULT: Using {result['chosen_model'].upper()}")
-        print(f"   Response preview: {result['response'][:100]}...")
-        print("=" * 70 + "\n")
+    async def ainvoke(self, user_input: str) -> str:
+        """
+        Asynchronous version of invoke() for callers running an event loop.
+
+        Args:
+            user_input: The user's message/query
 
+        Returns:
+            str: The agent's response
+        """
+        result = self._cached_result(user_input)
+        if result is None:
+            result = await route_query_async(user_input, self.models)
+            self._cache_result(user_input, result)
+        self._record(user_input, result["chosen_model"], result["reason"])
         return result["response"]
 
+    async def astream(self, user_input: str) -> AsyncIterator[str]:
+        """
+        Process user input through the graph, yielding response deltas.
+
+        The routed model is streamed so callers (e.g. the LiveKit TTS
+        pipeline) can start consuming the answer before it is complete.
+        The response memo of invoke() is not consulted: the voice agent
+        checks its own exact-match response cache before streaming.
+
+        Args:
+            user_input: The user's message/query
+
+        Yields:
+            str: The text of each chunk produced by the chosen model
+
+        Raises:
+            ModelStreamError: If the model call fails, before or after the
+                              first delta
+        """
+        chosen_model_name, reason = select_model(user_input)
+        chosen_model = self.models[chosen_model_name]
+        self._record(user_input, chosen_model_name, reason)
+
+        try:
+            logger.debug("📞 STREAMING %s...", chosen_model_name)
+            async for chunk in chosen_model.astream(user_input):
+                content = getattr(chunk, "content", chunk)
+                if content:
+                    yield content_to_text(content)
+            logger.debug("✅ %s STREAM COMPLETE", chosen_model_name)
+        except Exception as e:
+            logger.error("❌ ERROR from %s: %s", chosen_model_name, e)
+            # Raised rather than yielded, so callers can tell a partial answer
+            # from a complete one
+            raise ModelStreamError(f"{MODEL_ERROR_PREFIX}{str(e)}") from e
+
+    def clear_cache(self) -> None:
+        """Forget responses remembered by invoke() and ainvoke()."""
+        self._responses.clear()
+
+    def _cached_result(self, user_input: str) -> Optional[Dict[str, Any]]:
+        """Return the remembered route_query() result for an input, if any."""
+        result = self._responses.get(user_input)
+        if result is not None:
+            self._responses.move_to_end(user_input)
+        return result
+
+    def _cache_result(self, user_input: str, result: Dict[str, Any]) -> None:
+        """Remember a successful route_query() result, evicting the oldest."""
+        response = result["response"]
+        if isinstance(response, str) and response.startswith(MODEL_ERROR_PREFIX):
+            return
+        self._responses[user_input] = result
+        if len(self._responses) > RESPONSE_CACHE_SIZE:
+            self._responses.popitem(last=False)
+
+    def _record(self, user_input: str, model_name: str, reason: str) -> None:
+        """Append a routed turn to the conversation history."""
+        self.conversation_history.append(Turn(user_input, model_name, reason))
+
     def get_last_model_used(self) -> str:
         """Get the name of the last model that was used."""
         if self.conversation_history:
-            return self.conversation_history[-1]["model"]
+            return self.conversation_history[-1].model
         return "none"
 
 
@@ -379,15 +714,35 @@ def invoke_graph(graph: TravelAssistantGraph, user_input: str) -> str:
     return graph.invoke(user_input)
 
 
+async def ainvoke_graph(graph: TravelAssistantGraph, user_input: str) -> str:
+    """
+    Asynchronous version of invoke_graph().
+
+    Args:
+        graph: An initialized TravelAssistantGraph instance
+        user_input: The user's message/query
+
+    Returns:
+        str: The agent's response
+    """
+    return await graph.ainvoke(user_input)
+
+
 # ============================================================================
 # Testing and Debug
 # ============================================================================
 
+# Separator lines of the test output, built once
+_SEP_EQ = "=" * 70
+_SEP_DASH = "-" * 70
+
 if __name__ == "__main__":
+    # Show the routing debug logs while testing
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(logging.DEBUG)
+
     # Test the agent
-    print("=" * 70)
-    print("LANGGRAPH AGENT TEST")
-    print("=" * 70)
+    sys.stdout.write(f"{_SEP_EQ}\nLANGGRAPH AGENT TEST\n{_SEP_EQ}\n")
 
     # Create graph
     graph = create_graph()
@@ -399,9 +754,22 @@ if __name__ == "__main__":
         "Write a Python function for binary search",
     ]
 
-    for query in test_queries:
-        print(f"\nQuery: {query}")
-        response = invoke_graph(graph, query)
-        print(f"Response: {response[:200]}...")
-        print(f"Model used: {graph.get_last_model_used()}")
-        print("-" * 70)
+    async def run_test_queries():
+        # The queries are independent, so their model calls run concurrently
+        return await asyncio.gather(*(ainvoke_graph(graph, q) for q in test_queries))
+
+    responses = asyncio.run(run_test_queries())
+
+    # Turns are recorded in completion order; look the model up per query
+    models_used = {turn.user: turn.model for turn in graph.conversation_history}
+    # Emit the whole report with a single write
+    sys.stdout.write(
+        "".join(
+            f"\nQuery: {query}\n"
+            f"Response: {response[:200]}...\n"
+            f"Model used: {models_used[query]}\n"
+            f"{_SEP_DASH}\n"
+            for query, response in zip(test_queries, responses)
+        )
+    )
+    sys.stdout.flush()
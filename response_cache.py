@@ -0,0 +1,426 @@
+"""
+Response caching for the LangGraph voice adapter.
+
+This module implements a two-tier response cache that lets the voice agent
+answer repeated questions without another round trip to Gemini:
+
+    - Exact tier: an in-memory LRU keyed on the normalized user message,
+      cheap enough for the constant "hello"/"hi there" traffic of voice
+      sessions
+    - Semantic tier: user messages are embedded with a small
+      sentence-transformer model and compared against previously answered
+      messages, so paraphrased repeats ("plan a Paris trip" vs "help me
+      plan Paris") are served too
+
+Architecture (semantic tier):
+    1. Encoding: User messages are embedded into normalized vectors
+    2. Lookup: One matrix-vector product over the normalized embedding bank
+       finds the nearest cached message
+    3. Threshold: Matches at or above the cosine threshold are cache hits
+    4. Persistence: The index and responses can be written to disk so the
+       cache survives restarts. Only one process writes a given path (see
+       SemanticResponseCache); files are replaced atomically and validated
+       on load
+
+Dependencies:
+    - sentence-transformers is optional
+      (pip install "travel-assistant-livekit[cache]"). Without it
+      create_semantic_cache() returns None and semantic caching is disabled.
+    - numpy is already required by livekit-agents
+
+Integration:
+    - Used by agent.py through LangGraphLLMAdapter
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+import env_boot
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, see SemanticResponseCache
+    fcntl = None
+
+logger = logging.getLogger("response_cache")
+
+# Default embedding model: small, CPU friendly, 384-dimensional
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Minimum cosine similarity for a cached response to be reused
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+
+# Default number of entries kept by the exact-match tier
+DEFAULT_EXACT_CACHE_SIZE = 1024
+
+# Default number of entries kept by the semantic tier
+DEFAULT_SEMANTIC_CACHE_SIZE = 4096
+
+# Default number of new semantic entries buffered before the cache is saved
+DEFAULT_SAVE_EVERY = 32
+
+# Initial number of rows preallocated for semantic cache embeddings
+_INITIAL_CAPACITY = 64
+
+
+class ExactResponseCache:
+    """
+    Least-recently-used cache of responses keyed on the normalized message.
+
+    Messages are normalized with strip().lower() so that trivial casing and
+    whitespace differences from STT still hit.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_EXACT_CACHE_SIZE):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of responses kept before evicting the
+                     least recently used one
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+
+    def get(self, text: str) -> Optional[str]:
+        """
+        Return the cached response for a message, if any.
+
+        Args:
+            text: User message
+
+        Returns:
+            str or None: Cached response on a hit, None on a miss
+        """
+        key = text.strip().lower()
+        response = self._entries.get(key)
+        if response is not None:
+            self._entries.move_to_end(key)
+        return response
+
+    def put(self, text: str, response: str) -> None:
+        """
+        Store a response for a message, evicting the oldest entry if full.
+
+        Args:
+            text: User message
+            response: LangGraph response for the message
+        """
+        key = text.strip().lower()
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class SemanticResponseCache:
+    """
+    Cache of LangGraph responses keyed on the meaning of the user message.
+
+    Embeddings are L2-normalized once, at insert time, so the cosine
+    similarity against every cached message reduces to a single float32
+    matrix-vector product (a BLAS sgemv) followed by an argmax.
+
+    Methods are blocking (embedding is CPU bound) and safe to call from
+    worker threads; bank access is serialized with a lock.
+
+    The bank holds at most maxsize entries; once full, each new entry
+    overwrites the oldest one in place. When persisting, the first process
+    to open a path takes an exclusive lock on path + ".lock" and is its only
+    writer; other processes load the saved entries and cache new ones in
+    memory only, so they never overwrite each other's files. (Without fcntl,
+    e.g. on Windows, the lock is not enforced and at most one process
+    should be given the path.) Saves are batched: the files are rewritten
+    every save_every new entries, and callers should call save() on
+    shutdown to flush the rest.
+    """
+
+    def __init__(
+        self,
+        encoder,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        path: Optional[str] = None,
+        maxsize: int = DEFAULT_SEMANTIC_CACHE_SIZE,
+        save_every: int = DEFAULT_SAVE_EVERY,
+    ):
+        """
+        Initialize the cache, loading persisted embeddings if they exist.
+
+        Persisted files that are unreadable or do not match each other are
+        ignored (with a warning) and the cache starts empty. If the path
+        cannot be locked (e.g. its directory does not exist) the cache is
+        kept in memory only, also with a warning.
+
+        Args:
+            encoder: SentenceTransformer-compatible model with an encode() method
+            threshold: Minimum cosine similarity for a cache hit
+            path: Optional file path used to persist the embeddings; responses
+                  are stored next to it with a ".json" suffix
+            maxsize: Maximum number of entries kept before the oldest one is
+                     overwritten
+            save_every: Number of new entries added between saves to disk
+
+        Raises:
+            ValueError: If maxsize is less than 1
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        self.encoder = encoder
+        self.threshold = threshold
+        self.path = path
+        self.maxsize = maxsize
+        self.save_every = save_every
+        self.responses: List[str] = []
+        self._lock = threading.Lock()
+        # Row overwritten by the next add() once the bank is full
+        self._next = 0
+        # Entries added since the cache was last written to disk
+        self._unsaved = 0
+
+        dim = encoder.get_sentence_embedding_dimension()
+        # Preallocated embedding bank; rows [0, len(responses)) are in use and
+        # capacity doubles up to maxsize so inserts stay amortized O(dim)
+        self._bank = np.empty((min(_INITIAL_CAPACITY, maxsize), dim), dtype=np.float32)
+
+        # Only the process holding the writer lock persists the cache
+        self._lock_file = _acquire_writer_lock(path) if path else None
+        self._writer = self._lock_file is not None
+
+        if path and os.path.exists(path) and os.path.exists(path + ".json"):
+            self._load(dim)
+
+    def encode(self, text: str) -> np.ndarray:
+        """
+        Embed a user message into a normalized (dim,) float32 vector.
+
+        Args:
+            text: User message
+
+        Returns:
+            numpy.ndarray: Normalized embedding ready for search() or add()
+        """
+        return self.encoder.encode(
+            text, normalize_embeddings=True, convert_to_numpy=True
+        ).astype(np.float32, copy=False)
+
+    def search(self, embedding: np.ndarray) -> Optional[str]:
+        """
+        Return the cached response closest to an embedding, if close enough.
+
+        Args:
+            embedding: Output of encode()
+
+        Returns:
+            str or None: Cached response on a hit, None on a miss
+        """
+        with self._lock:
+            size = len(self.responses)
+            if size == 0:
+                return None
+            scores = self._bank[:size] @ embedding
+            best = int(scores.argmax())
+            if scores[best] >= self.threshold:
+                return self.responses[best]
+        return None
+
+    def lookup(self, text: str) -> Tuple[Optional[str], object]:
+        """
+        Encode a user message and search for a cached response in one call.
+
+        Args:
+            text: User message
+
+        Returns:
+            tuple: (cached response or None, embedding for a later add())
+        """
+        embedding = self.encode(text)
+        return self.search(embedding), embedding
+
+    def add(self, embedding: np.ndarray, response: str) -> None:
+        """
+        Store a response under an embedding.
+
+        When the cache is full the oldest entry is overwritten. The cache is
+        only written to disk by the process holding the path's writer lock,
+        once every save_every new entries.
+
+        Args:
+            embedding: Output of encode() for the user message
+            response: LangGraph response to reuse for similar messages
+        """
+        with self._lock:
+            size = len(self.responses)
+            if size < self.maxsize:
+                self._reserve(size + 1)
+                self._bank[size] = embedding
+                self.responses.append(response)
+            else:
+                # Full: replace the oldest entry in place (search() scores
+                # every row, so row order does not matter)
+                self._bank[self._next] = embedding
+                self.responses[self._next] = response
+                self._next = (self._next + 1) % self.maxsize
+            self._unsaved += 1
+            if self._writer and self._unsaved >= self.save_every:
+                self._save()
+
+    def save(self) -> None:
+        """Write unsaved entries to disk (writer process only)."""
+        with self._lock:
+            if self._writer and self._unsaved:
+                self._save()
+
+    def _load(self, dim: int) -> None:
+        try:
+            with open(self.path, "rb") as f:
+                saved = np.load(f)
+            with open(self.path + ".json", encoding="utf-8") as f:
+                responses = json.load(f)
+        except (OSError, ValueError, EOFError) as e:
+            logger.warning("⚠️ Ignoring unreadable semantic cache %s: %s", self.path, e)
+            return
+        if (
+            saved.ndim != 2
+            or saved.shape[1] != dim
+            or not isinstance(responses, list)
+            or len(saved) != len(responses)
+        ):
+            logger.warning(
+                "⚠️ Ignoring semantic cache %s: embeddings and responses do not match",
+                self.path,
+            )
+            return
+        # Keep the most recent entries if the cache was saved with a larger maxsize
+        saved = saved[max(len(saved) - self.maxsize, 0) :]
+        responses = responses[len(responses) - len(saved) :]
+        self._reserve(len(saved))
+        self._bank[: len(saved)] = saved
+        self.responses = responses
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._bank)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        capacity = min(capacity, self.maxsize)
+        bank = np.empty((capacity, self._bank.shape[1]), dtype=np.float32)
+        used = len(self.responses)
+        bank[:used] = self._bank[:used]
+        self._bank = bank
+
+    def _save(self) -> None:
+        # Saved oldest first, so a reloaded full cache overwrites from row 0
+        bank = self._bank[: len(self.responses)]
+        responses = self.responses
+        if self._next:
+            bank = np.concatenate((bank[self._next :], bank[: self._next]))
+            responses = responses[self._next :] + responses[: self._next]
+        # Write each file to a temporary sibling and rename it into place,
+        # so a crash never leaves a torn file behind
+        _write_atomic(self.path, lambda f: np.save(f, bank))
+        _write_atomic(
+            self.path + ".json",
+            lambda f: f.write(json.dumps(responses).encode("utf-8")),
+        )
+        self._unsaved = 0
+
+
+def _acquire_writer_lock(path: str):
+    """
+    Take the exclusive writer lock of a semantic cache path without waiting.
+
+    Args:
+        path: Cache path; the lock file is path + ".lock"
+
+    Returns:
+        file or None: Open lock file (held until the process exits), or None
+        if another process already holds the lock or the lock file cannot be
+        opened
+    """
+    try:
+        lock_file = open(path + ".lock", "a+b")
+    except OSError as e:
+        logger.warning(
+            "⚠️ Cannot lock semantic cache %s, caching in memory only: %s", path, e
+        )
+        return None
+    if fcntl is None:
+        return lock_file
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        logger.info(
+            "Semantic cache %s is written by another process; caching new"
+            " entries in memory only",
+            path,
+        )
+        return None
+    return lock_file
+
+
+def _write_atomic(path: str, write) -> None:
+    """
+    Replace a file atomically with the bytes produced by write(file).
+
+    Args:
+        path: Destination file path
+        write: Callable writing the new contents to a binary file object
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), prefix=".tmp-"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def create_semantic_cache() -> Optional[SemanticResponseCache]:
+    """
+    Create the semantic response cache if its optional dependencies exist.
+
+    Configuration is read from the environment:
+        SEMANTIC_CACHE_PATH: Optional file path to persist the cache
+        SEMANTIC_CACHE_THRESHOLD: Cosine similarity threshold (default 0.92)
+        SEMANTIC_CACHE_SIZE: Maximum number of entries (default 4096)
+
+    Returns:
+        SemanticResponseCache or None: None when sentence-transformers is not
+        installed or SEMANTIC_CACHE_SIZE is less than 1
+    """
+    env_boot.boot()
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        logger.warning("⚠️ Semantic cache disabled (install sentence-transformers)")
+        return None
+
+    threshold = float(
+        os.getenv("SEMANTIC_CACHE_THRESHOLD", DEFAULT_SIMILARITY_THRESHOLD)
+    )
+    path = os.getenv("SEMANTIC_CACHE_PATH") or None
+    maxsize = int(os.getenv("SEMANTIC_CACHE_SIZE", DEFAULT_SEMANTIC_CACHE_SIZE))
+    if maxsize < 1:
+        logger.warning(
+            "⚠️ Semantic cache disabled (SEMANTIC_CACHE_SIZE must be at least 1)"
+        )
+        return None
+
+    return SemanticResponseCache(
+        SentenceTransformer(DEFAULT_EMBEDDING_MODEL),
+        threshold=threshold,
+        path=path,
+        maxsize=maxsize,
+    )
@@ -0,0 +1,94 @@
+"""
+Regression tests for generate_token() in agent.py.
+
+generate_token() signs its JWTs directly with hmac instead of going through
+api.AccessToken.to_jwt(), so these tests check that the SDK's verifier
+accepts the tokens and that their claims match what the SDK would mint.
+
+Run with: pytest test_agent_tokens.py
+"""
+
+import base64
+import json
+from datetime import timedelta
+
+import pytest
+from livekit import api
+
+import agent
+import env_boot
+
+API_KEY = "test-key"
+API_SECRET = "test-secret-that-is-long-enough-for-hs256"
+
+
+def _payload(token: str) -> dict:
+    """Decode the claims of a JWT without verifying it."""
+    payload = token.split(".")[1]
+    return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    """Provide test credentials and start every test with empty caches."""
+    # Keep a local .env from filling in (or replacing) the test environment
+    monkeypatch.setattr(env_boot, "_LOADED", True)
+    monkeypatch.setenv("LIVEKIT_API_KEY", API_KEY)
+    monkeypatch.setenv("LIVEKIT_API_SECRET", API_SECRET)
+    agent._reset_env_cache()
+    yield
+    agent._reset_env_cache()
+
+
+def test_token_is_accepted_by_token_verifier():
+    token = agent.generate_token("travel-room", "user-1")
+
+    claims = api.TokenVerifier(API_KEY, API_SECRET).verify(token)
+
+    assert claims.identity == "user-1"
+    assert claims.name == "user-1"
+    assert claims.video.room == "travel-room"
+    assert claims.video.room_join
+    assert claims.video.can_publish
+    assert claims.video.can_subscribe
+
+
+def test_token_claims_match_access_token():
+    token = agent.generate_token("travel-room", "user-1")
+    expected = (
+        api.AccessToken(API_KEY, API_SECRET)
+        .with_identity("user-1")
+        .with_name("user-1")
+        .with_grants(
+            api.VideoGrants(
+                room_join=True,
+                room="travel-room",
+                can_publish=True,
+                can_subscribe=True,
+            )
+        )
+        .with_ttl(timedelta(hours=1))
+        .to_jwt()
+    )
+
+    claims, expected_claims = _payload(token), _payload(expected)
+    # Both tokens are valid for one hour; they may be minted a second apart
+    assert claims.pop("exp") - claims.pop("nbf") == 3600
+    assert expected_claims.pop("exp") - expected_claims.pop("nbf") == 3600
+    assert claims == expected_claims
+
+
+def test_token_is_reused_for_same_room_and_participant():
+    token = agent.generate_token("travel-room", "user-1")
+
+    assert agent.generate_token("travel-room", "user-1") == token
+    assert agent.generate_token("travel-room", "user-2") != token
+    assert agent.generate_token("other-room", "user-1") != token
+
+
+def test_missing_credentials_raise(monkeypatch):
+    monkeypatch.delenv("LIVEKIT_API_SECRET")
+    agent._reset_env_cache()
+
+    with pytest.raises(ValueError):
+        agent.generate_token("travel-room", "user-1")